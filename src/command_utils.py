@@ -1,9 +1,10 @@
 from ssh_copy import ssh_copy
 
 
-def execute_copy_command(hostname, username, password, local_path, remote_path):
-    return ssh_copy(hostname, username, password, local_path, remote_path)
+def execute_copy_command(hostname, username, password, local_path, remote_path, client=None):
+    return ssh_copy(hostname, username, password, local_path, remote_path, client=client)
 
 BUILTIN_COMMANDS = {
-    "ssh_copy": execute_copy_command,
+    # Keyed by the command_combo entry in ui.ui
+    "copy": execute_copy_command,
 }
\ No newline at end of file
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 def generate_credentials(num):
     """
     Generate hostname, username, and password based on the given number.
@@ -5,13 +8,19 @@ def generate_credentials(num):
     For 10-99: Returns TWO credential sets - one with 0xx format and one with xx format for hostname
                (username and password always use 0xx format)
     :param num: int or str, the number to use
-    :return: list of tuples [(hostname, username, password), ...]
+    :return: tuple of tuples ((hostname, username, password), ...); results are
+             cached, so the value is immutable
     """
     try:
         n = int(num)
     except Exception:
         raise ValueError("Input must be an integer or string representing an integer.")
-    
+    return _generate_credentials_cached(n)
+
+
+@lru_cache(maxsize=None)
+def _generate_credentials_cached(n):
+    """Credential sets for an already-parsed int, memoized per number."""
     # Always use 3-digit format for username and password
     xxx_3digit = f"{n:03d}"
     username = f"uss01sth{xxx_3digit}ts01"
@@ -20,16 +29,36 @@ def generate_credentials(num):
     if 1 <= n <= 9:
         # For 1-9: use 00x format for hostname
         hostname = f"css01sth{xxx_3digit}ts01"
-        return [(hostname, username, password)]
+        return ((hostname, username, password),)
     elif 10 <= n <= 99:
         # For 10-99: return BOTH 0xx and xx format hostnames
         hostname_3digit = f"css01sth{xxx_3digit}ts01"
         hostname_2digit = f"css01sth{n}ts01"
-        return [
+        return (
             (hostname_3digit, username, password),
             (hostname_2digit, username, password)
-        ]
+        )
     else:
         # For 100+: use the number as-is
         hostname = f"css01sth{n}ts01"
-        return [(hostname, username, password)]
\ No newline at end of file
+        return ((hostname, username, password),)
+
+
+def generate_credentials_batch(nums):
+    """
+    Generate credentials for many numbers in one call, as parallel lists.
+    A hostname produced by more than one number is only kept the first time.
+    :param nums: iterable of int or str
+    :return: tuple (hostnames, usernames, passwords) of equal-length lists
+    """
+    hostnames, usernames, passwords = [], [], []
+    seen = set()
+    for num in nums:
+        for hostname, username, password in generate_credentials(num):
+            if hostname in seen:
+                continue
+            seen.add(hostname)
+            hostnames.append(hostname)
+            usernames.append(username)
+            passwords.append(password)
+    return hostnames, usernames, passwords
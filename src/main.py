@@ -1,114 +1,180 @@
 # Import necessary modules
+import atexit
+import csv
+import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
 # Worker for threaded pinging with progress updates
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-import pandas as pd
-import paramiko
 from PyQt5 import QtWidgets, uic
-from PyQt5.QtCore import QRegExp, QThread, pyqtSignal
+from PyQt5.QtCore import QRegularExpression, QThread, pyqtSignal
 from PyQt5.QtGui import (
     QIntValidator,
-    QRegExpValidator,
+    QRegularExpressionValidator,
     QStandardItem,
     QStandardItemModel,
 )
 
 from command_utils import BUILTIN_COMMANDS
-from credentials_generator import generate_credentials
-from ping_utils import ping_host
+from credentials_generator import generate_credentials_batch
+from ping_cache import cached_ping_hosts, invalidate_pings
 from scan_utils import export_scan_to_csv, scan_host
+from ssh_pool import SSHConnectionPool, run_command
+
+logger = logging.getLogger(__name__)
+
+# Input validators are stateless, so they are built once and shared
+_INT_VALIDATOR = QIntValidator()
+_LIST_REGEX = QRegularExpression(r'^\s*-?\d+(\s*,\s*-?\d+)*\s*$')
+_LIST_VALIDATOR = QRegularExpressionValidator(_LIST_REGEX)
+
+# Shared across runs so re-executing on the same hosts reuses live connections
+_ssh_pool = SSHConnectionPool()
+
+# The pingable column only ever holds these two values; rows get clones
+_PINGABLE_ITEMS = {'Yes': QStandardItem('Yes'), 'No': QStandardItem('No')}
+
+
+class ProgressThrottle:
+    """
+    Convert completion counts into a percentage so workers signal the UI at
+    most ~100 times per run instead of once per host, and no more often than
+    every min_interval seconds when hosts complete in quick bursts. A value
+    held back by the interval is released by a later flush(), never dropped.
+    """
+
+    def __init__(self, total, min_interval=0.05):
+        self.total = total
+        self.min_interval = min_interval
+        self._pct = -1
+        self._last_pct = -1
+        self._last_time = float('-inf')
+
+    def update(self, completed):
+        """Record progress; return the percentage to emit, or None if nothing is due yet."""
+        self._pct = completed * 100 // self.total if self.total else 100
+        return self.flush()
+
+    def flush(self):
+        """Return the latest percentage if it is new and the interval has passed, else None."""
+        pct = self._pct
+        if pct == self._last_pct:
+            return None
+        now = time.monotonic()
+        # The final value always goes through so the bar never stops short
+        if pct < 100 and now - self._last_time < self.min_interval:
+            return None
+        self._last_pct = pct
+        self._last_time = now
+        return pct
+
+    def wait_time(self):
+        """Seconds until a held-back percentage is due, or None if none is held back."""
+        if self._pct == self._last_pct:
+            return None
+        return max(0.0, self._last_time + self.min_interval - time.monotonic())
 
 
 class ExecutionWorker(QThread):
     progress = pyqtSignal(int)
     finished = pyqtSignal(list)
 
-    def __init__(self, host_infos, do_builtin, do_custom, local_path, remote_path, custom_cmd, parent=None):
+    def __init__(self, hostnames, usernames, passwords, executor, do_builtin, do_custom, local_path, remote_path, custom_cmd, builtin_cmd='', parent=None):
         super().__init__(parent)
-        self.host_infos = host_infos
+        # Parallel lists, one entry per host
+        self.hostnames = hostnames
+        self.usernames = usernames
+        self.passwords = passwords
+        self.executor = executor
         self.do_builtin = do_builtin
         self.do_custom = do_custom
         self.local_path = local_path
         self.remote_path = remote_path
         self.custom_cmd = custom_cmd
+        self.builtin_cmd = builtin_cmd
+        # Loop invariants for the per-host worker
+        self._builtin_func = BUILTIN_COMMANDS.get(builtin_cmd)
+        self._n_hosts = len(hostnames)
+        self._cmds = [c.strip() for c in custom_cmd.split('&&') if c.strip()]
+        # One channel for the whole chain; the remote shell evaluates '&&'
+        self._full_cmd = ' && '.join(self._cmds)
+        self._futures = []
+        self._stopped = False
+
+    def stop(self):
+        """
+        Cancel hosts that have not started yet. The executor is shared with
+        other runs, so it is left running; hosts already in progress finish.
+        """
+        self._stopped = True
+        for future in self._futures:
+            future.cancel()
 
     def run(self):
-        print(f"[LOG] ExecutionWorker started for {len(self.host_infos)} hosts")
-        print(f"[LOG] Mode - Builtin: {self.do_builtin}, Custom: {self.do_custom}")
-        results = [None] * len(self.host_infos)
-
-        def worker(idx, info):
-            host = info['hostname']
-            username = info['username']
-            password = info['password']
-            row = {'hostname': host, 'pingable': False, 'cmd_result': ''}
-            print(f"[LOG] [{idx+1}/{len(self.host_infos)}] Starting worker for {host}")
+        logger.debug("ExecutionWorker started for %s hosts", self._n_hosts)
+        logger.debug("Mode - Builtin: %s, Custom: %s", self.do_builtin, self.do_custom)
+        results = [None] * self._n_hosts
+
+        def worker(idx, host, username, password):
+            # Only pingable hosts are submitted, see below
+            row = {'hostname': host, 'pingable': True, 'cmd_result': ''}
+            logger.debug("[%s/%s] Starting worker for %s", idx+1, self._n_hosts, host)
             
-            # Step 1: Always ping first
-            print(f"[LOG] [{idx+1}] Pinging {host}...")
+            # Steps 2 and 3 share one pooled SSH connection per host
+            results = None
+            custom_result = None
             try:
-                pingable = ping_host(host)
-                print(f"[LOG] [{idx+1}] {host} pingable: {pingable}")
+                with _ssh_pool.borrow(host, username, password) as ssh:
+                    logger.debug("[%s] SSH connected to %s", idx+1, host)
+
+                    # Step 2: Execute built-in command (copy) if requested
+                    if self.do_builtin:
+                        logger.debug("[%s] Executing built-in %s command for %s", idx+1, self.builtin_cmd, host)
+                        try:
+                            command_func = self._builtin_func
+                            if command_func:
+                                results = command_func(host, username, password, self.local_path, self.remote_path, client=ssh)
+                                logger.debug("[%s] Built-in %s command completed for %s", idx+1, self.builtin_cmd, host)
+                            else:
+                                results = f'Unknown built-in command: {self.builtin_cmd}'
+                                logger.debug("[%s] Unknown built-in command for %s", idx+1, host)
+                        except Exception as e:
+                            results = f'Execute failed: {e}'
+                            logger.warning("[%s] Execute exception for %s: %s", idx+1, host, e)
+
+                    # Step 3: Execute custom command if requested
+                    if self.do_custom:
+                        logger.debug("[%s] Executing custom command for %s", idx+1, host)
+                        try:
+                            full_cmd = self._full_cmd
+                            logger.debug("[%s] Running command on %s: %s", idx+1, host, full_cmd)
+                            # stderr is merged in, so warnings and errors show in order with the output
+                            status, cmd_out, _ = run_command(ssh, full_cmd, timeout=30, combine_stderr=True)
+                            # Many tools write benign output to stderr, so judge by exit status
+                            if status != 0:
+                                custom_result = f'ERR: {cmd_out}'
+                            else:
+                                custom_result = cmd_out
+                            logger.debug("[%s] Custom command completed for %s", idx+1, host)
+                        except Exception as e:
+                            custom_result = f'SSH ERR: {e}'
+                            logger.warning("[%s] SSH exception for %s: %s", idx+1, host, e)
             except Exception as e:
-                print(f"[LOG] [{idx+1}] Ping failed for {host}: {e}")
-                pingable = False
-            
-            row['pingable'] = pingable
-            if not pingable:
-                row['cmd_result'] = 'Unreachable'
-                print(f"[LOG] [{idx+1}] {host} unreachable, skipping")
-                return idx, row
-            
-            # Step 2: Execute built-in command (copy) if requested
-            if self.do_builtin:
-                print(f"[LOG] [{idx+1}] Executing built-in {self.builtin_cmd} command for {host}")
-                try:
-                    command_func = BUILTIN_COMMANDS.get(self.builtin_cmd)
-                    if command_func:
-                        results = command_func(host, username, password, self.local_path, self.remote_path)
-                        print(f"[LOG] [{idx+1}] Built-in {self.builtin_cmd} command completed for {host}")
-                    else:
-                        results = f'Unknown built-in command: {self.builtin_cmd}'
-                        print(f"[LOG] [{idx+1}] Unknown built-in command for {host}")
-                except Exception as e:
+                logger.warning("[%s] SSH connection failed for %s: %s", idx+1, host, e)
+                if results is None:
                     results = f'Execute failed: {e}'
-                    print(f"[LOG] [{idx+1}] Execute exception for {host}: {e}")
-            
-            # Step 3: Execute custom command if requested
-            custom_result = None
-            if self.do_custom:
-                print(f"[LOG] [{idx+1}] Executing custom command for {host}")
-                ssh = None
-                try:
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(host, username=username, password=password, timeout=5)
-                    print(f"[LOG] [{idx+1}] SSH connected to {host}")
-                    cmds = [c.strip() for c in self.custom_cmd.split('&&') if c.strip()]
-                    cmd_results = []
-                    for cmd in cmds:
-                        print(f"[LOG] [{idx+1}] Running command on {host}: {cmd}")
-                        stdin, stdout, stderr = ssh.exec_command(cmd)
-                        cmd_out = stdout.read().decode(errors='replace').strip()
-                        cmd_err = stderr.read().decode(errors='replace').strip()
-                        if cmd_err:
-                            cmd_results.append(f'ERR: {cmd_err}')
-                        else:
-                            cmd_results.append(cmd_out)
-                    custom_result = '\n'.join(cmd_results)
-                    print(f"[LOG] [{idx+1}] Custom command completed for {host}")
-                except Exception as e:
+                if custom_result is None:
                     custom_result = f'SSH ERR: {e}'
-                    print(f"[LOG] [{idx+1}] SSH exception for {host}: {e}")
-                finally:
-                    if ssh is not None:
-                        try:
-                            ssh.close()
-                        except Exception:
-                            pass
-            
+
             # Combine results based on mode
             if self.do_builtin and self.do_custom:
                 row['cmd_result'] = f'{results}\n---\n{custom_result}'
@@ -117,21 +183,56 @@ class ExecutionWorker(QThread):
             elif self.do_custom:
                 row['cmd_result'] = custom_result
             
-            print(f"[LOG] [{idx+1}] Worker completed for {host}")
+            logger.debug("[%s] Worker completed for %s", idx+1, host)
             return idx, row
 
-        # Run all workers in parallel with ThreadPoolExecutor
-        print(f"[LOG] Starting ThreadPoolExecutor with 30 workers")
-        with ThreadPoolExecutor(max_workers=30) as executor:
-            futures = [executor.submit(worker, idx, info) for idx, info in enumerate(self.host_infos)]
-            print(f"[LOG] Submitted {len(futures)} tasks to executor")
-            for i, future in enumerate(as_completed(futures), 1):
-                idx, row = future.result()
-                results[idx] = row
-                print(f"[LOG] Progress: {i}/{len(self.host_infos)} completed")
-                self.progress.emit(i)
-
-        print(f"[LOG] All workers completed, emitting finished signal")
+        # Ping every host in one batch; unreachable hosts never reach the SSH pool
+        logger.debug("Pinging %s hosts", self._n_hosts)
+        pingable_map = cached_ping_hosts(self.hostnames)
+        reachable = []
+        for idx, host in enumerate(self.hostnames):
+            if pingable_map.get(host, False):
+                reachable.append(idx)
+            else:
+                results[idx] = {'hostname': host, 'pingable': False, 'cmd_result': 'Unreachable'}
+        done = self._n_hosts - len(reachable)
+        logger.debug("%s hosts unreachable, skipping", done)
+        # Progress is reported in percent, and only when the percentage changes
+        throttle = ProgressThrottle(self._n_hosts)
+        if done:
+            self.progress.emit(throttle.update(done))
+
+        # Run all workers in parallel on the application's shared thread pool
+        hostnames, usernames, passwords = self.hostnames, self.usernames, self.passwords
+        self._futures = futures = [self.executor.submit(worker, i, hostnames[i], usernames[i], passwords[i]) for i in reachable]
+        if self._stopped:
+            self.stop()
+        logger.debug("Submitted %s tasks to executor", len(futures))
+        pending = set(futures)
+        completed = done
+        while pending:
+            # Also wake when a held-back percentage falls due, so the bar keeps up
+            # while the remaining hosts are still running
+            finished, pending = wait(pending, timeout=throttle.wait_time(), return_when=FIRST_COMPLETED)
+            for future in finished:
+                completed += 1
+                if not future.cancelled():
+                    idx, row = future.result()
+                    results[idx] = row
+                logger.debug("Progress: %s/%s completed", completed, self._n_hosts)
+                pct = throttle.update(completed)
+                if pct is not None:
+                    self.progress.emit(pct)
+            if not finished:
+                pct = throttle.flush()
+                if pct is not None:
+                    self.progress.emit(pct)
+
+        for idx, future in zip(reachable, futures):
+            if future.cancelled():
+                results[idx] = {'hostname': hostnames[idx], 'pingable': True, 'cmd_result': 'Cancelled'}
+
+        logger.debug("All workers completed, emitting finished signal")
         self.finished.emit(results)
 
 
@@ -139,49 +240,170 @@ class ScanWorker(QThread):
     progress = pyqtSignal(int)
     finished = pyqtSignal(list)
 
-    def __init__(self, host_infos, parent=None):
+    def __init__(self, hostnames, usernames, passwords, executor, parent=None):
         super().__init__(parent)
-        self.host_infos = host_infos
+        # Parallel lists, one entry per host
+        self.hostnames = hostnames
+        self.usernames = usernames
+        self.passwords = passwords
+        self.executor = executor
+        self._futures = []
+        self._stopped = False
+
+    def stop(self):
+        """
+        Cancel hosts that have not started yet. The executor is shared with
+        other runs, so it is left running; hosts already in progress finish.
+        """
+        self._stopped = True
+        for future in self._futures:
+            future.cancel()
 
     def run(self):
-        print(f"[LOG] ScanWorker started for {len(self.host_infos)} hosts")
-        results = [None] * len(self.host_infos)
-
-        def worker(idx, info):
-            host = info['hostname']
-            username = info['username']
-            password = info['password']
-            print(f"[LOG] [{idx+1}/{len(self.host_infos)}] Scanning {host}...")
+        n_hosts = len(self.hostnames)
+        logger.debug("ScanWorker started for %s hosts", n_hosts)
+        results = [None] * n_hosts
+
+        def worker(idx, host, username, password):
+            logger.debug("[%s/%s] Scanning %s...", idx+1, n_hosts, host)
             
-            result = scan_host(host, username, password)
-            print(f"[LOG] [{idx+1}] Scan completed for {host}")
+            try:
+                with _ssh_pool.borrow(host, username, password) as ssh:
+                    result = scan_host(host, username, password, pingable=True, client=ssh)
+            except Exception as e:
+                logger.warning("[%s] SSH connection failed for %s: %s", idx+1, host, e)
+                result = {'hostname': host, 'username': username, 'password': password,
+                          'pingable': True, 'scan_result': f'SSH Error: {e}'}
+            logger.debug("[%s] Scan completed for %s", idx+1, host)
             return idx, result
 
-        # Run all workers in parallel with ThreadPoolExecutor
-        print(f"[LOG] Starting ThreadPoolExecutor for scan with 30 workers")
-        with ThreadPoolExecutor(max_workers=30) as executor:
-            futures = [executor.submit(worker, idx, info) for idx, info in enumerate(self.host_infos)]
-            print(f"[LOG] Submitted {len(futures)} scan tasks to executor")
-            for i, future in enumerate(as_completed(futures), 1):
-                idx, result = future.result()
-                results[idx] = result
-                print(f"[LOG] Scan progress: {i}/{len(self.host_infos)} completed")
-                self.progress.emit(i)
-
-        print(f"[LOG] All scan workers completed, emitting finished signal")
+        # Ping every host in one batch; unreachable hosts never reach the SSH pool
+        logger.debug("Pinging %s hosts for scan", n_hosts)
+        hostnames, usernames, passwords = self.hostnames, self.usernames, self.passwords
+        pingable_map = cached_ping_hosts(hostnames)
+        reachable = []
+        for idx, host in enumerate(hostnames):
+            if pingable_map.get(host, False):
+                reachable.append(idx)
+            else:
+                results[idx] = scan_host(host, usernames[idx], passwords[idx], pingable=False)
+        done = n_hosts - len(reachable)
+        logger.debug("%s hosts unreachable, skipping scan", done)
+        # Progress is reported in percent, and only when the percentage changes
+        throttle = ProgressThrottle(n_hosts)
+        if done:
+            self.progress.emit(throttle.update(done))
+
+        # Run all workers in parallel on the application's shared thread pool
+        self._futures = futures = [self.executor.submit(worker, i, hostnames[i], usernames[i], passwords[i]) for i in reachable]
+        if self._stopped:
+            self.stop()
+        logger.debug("Submitted %s scan tasks to executor", len(futures))
+        pending = set(futures)
+        completed = done
+        while pending:
+            # Also wake when a held-back percentage falls due, so the bar keeps up
+            # while the remaining hosts are still running
+            finished, pending = wait(pending, timeout=throttle.wait_time(), return_when=FIRST_COMPLETED)
+            for future in finished:
+                completed += 1
+                if not future.cancelled():
+                    idx, result = future.result()
+                    results[idx] = result
+                logger.debug("Scan progress: %s/%s completed", completed, n_hosts)
+                pct = throttle.update(completed)
+                if pct is not None:
+                    self.progress.emit(pct)
+            if not finished:
+                pct = throttle.flush()
+                if pct is not None:
+                    self.progress.emit(pct)
+
+        for idx, future in zip(reachable, futures):
+            if future.cancelled():
+                results[idx] = {'hostname': hostnames[idx], 'username': usernames[idx], 'password': passwords[idx],
+                                'pingable': True, 'scan_result': 'Cancelled'}
+
+        logger.debug("All scan workers completed, emitting finished signal")
         self.finished.emit(results)
 
 
+class ExportWorker(QThread):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, headers, rows, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.headers = headers
+        # show_results replaces the row list rather than mutating it, so no copy is needed
+        self.rows = rows
+
+    def run(self):
+        logger.debug("ExportWorker writing %s rows to %s", len(self.rows), self.path)
+        try:
+            with open(self.path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(self.headers)
+                # Stream row by row so progress can be reported along the way
+                for i, row in enumerate(self.rows, 1):
+                    writer.writerow(row)
+                    if i % 1000 == 0:
+                        self.progress.emit(i)
+        except OSError as e:
+            logger.error("Export to %s failed: %s", self.path, e)
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(self.path)
+
+
+def setup_logging(level=logging.WARNING):
+    """
+    Route all log records through a queue so worker threads never block on
+    console I/O; a single listener thread does the actual writing.
+    """
+    log_queue = queue.Queue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('[%(levelname)s] %(name)s: %(message)s'))
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+def raise_fd_limit(target=65536):
+    """Raise the soft open-file limit so large batches of SSH sessions don't hit EMFILE."""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = target if hard == resource.RLIM_INFINITY else min(target, hard)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+        except (ValueError, OSError) as e:
+            logger.warning("Could not raise open file limit: %s", e)
+
+
+def compute_max_workers(fds_per_session=5, reserved_fds=64, cap=200):
+    """Size the SSH thread pool from the open-file limit instead of a fixed count."""
+    if resource is None:
+        return 30
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return cap
+    return max(4, min(cap, (soft - reserved_fds) // fds_per_session))
+
+
 def setup_validators(window):
 	# Only allow integers in range_from and range_to
-	int_validator = QIntValidator()
-	window.range_from.setValidator(int_validator)
-	window.range_to.setValidator(int_validator)
+	window.range_from.setValidator(_INT_VALIDATOR)
+	window.range_to.setValidator(_INT_VALIDATOR)
 
 	# Allow only comma-separated numbers (with optional spaces) in list_edit
-	regex = QRegExp(r'\s*-?\d+(\s*,\s*-?\d+)*\s*')
-	reg_validator = QRegExpValidator(regex)
-	window.list_edit.setValidator(reg_validator)
+	window.list_edit.setValidator(_LIST_VALIDATOR)
 
 def handle_radio_buttons(window):
 	def update_elements():
@@ -200,6 +422,38 @@ def handle_radio_buttons(window):
 	update_elements()
 
 
+def show_results(window, results, result_key):
+    """
+    Fill result_table with the worker results, pingable hosts first and then
+    by hostname. result_key names the third column ('cmd_result' or 'scan_result').
+    """
+    results = sorted(results, key=lambda r: (not r['pingable'], r['hostname']))
+    rows = [(str(r['hostname']), 'Yes' if r['pingable'] else 'No', str(r[result_key])) for r in results]
+    # Kept for on_export, which writes these rows instead of reading the model back
+    window._source_headers = ['hostname', 'pingable', result_key]
+    window._source_rows = rows
+    # Refill the persistent model in place; swapping models would make the view
+    # drop and rebuild all of its cached state
+    model = window._result_model
+    table = window.result_table
+    header = table.horizontalHeader()
+    # Repaint once after the fill instead of after every inserted cell; auto-sizing
+    # columns also re-measure on every insert, so pause that too
+    table.setUpdatesEnabled(False)
+    header.setSectionResizeMode(0, QtWidgets.QHeaderView.Interactive)
+    header.setSectionResizeMode(1, QtWidgets.QHeaderView.Interactive)
+    model.setRowCount(0)
+    model.setHorizontalHeaderLabels(window._source_headers)
+    model.setRowCount(len(rows))
+    for i, (hostname, pingable, result) in enumerate(rows):
+        model.setItem(i, 0, QStandardItem(hostname))
+        model.setItem(i, 1, _PINGABLE_ITEMS[pingable].clone())
+        model.setItem(i, 2, QStandardItem(result))
+    header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
+    header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
+    table.setUpdatesEnabled(True)
+
+
 def handle_execute(window):
     # Combo box logic for built-in command 'copy'
     def on_command_changed():
@@ -227,7 +481,7 @@ def handle_execute(window):
 
     # Browse button logic
     def on_browse():
-        option = window.file_folder.currentText().strip().lower() if hasattr(window, 'file_folder') else 'file'
+        option = window.file_folder.currentText().strip().lower()
         if option == 'folder':
             folder = QtWidgets.QFileDialog.getExistingDirectory(window, 'Select Folder')
             if folder:
@@ -240,33 +494,37 @@ def handle_execute(window):
 
     # Connect the export button to export the table to CSV
     def on_export():
-        model = window.result_table.model()
-        if model is None or model.rowCount() == 0:
+        rows = window._source_rows
+        if not rows:
             QtWidgets.QMessageBox.information(window, 'Export', 'No data to export.')
             return
         # Prompt for file path
         path, _ = QtWidgets.QFileDialog.getSaveFileName(window, 'Save CSV', '', 'CSV Files (*.csv)')
         if not path:
             return
-        # Write to CSV
-        with open(path, 'w', encoding='utf-8', newline='') as f:
-            import csv
-            writer = csv.writer(f)
-            # Write headers
-            headers = [model.headerData(i, 1) for i in range(model.columnCount())]
-            writer.writerow(headers)
-            # Write data rows
-            for row in range(model.rowCount()):
-                rowdata = [model.data(model.index(row, col)) for col in range(model.columnCount())]
-                writer.writerow(rowdata)
-        QtWidgets.QMessageBox.information(window, 'Export', f'Exported to {path}')
-        window.export.clicked.connect(on_export)
+        # Write on a worker thread so large tables don't freeze the UI
+        window.progressBar.setMinimum(0)
+        window.progressBar.setMaximum(len(rows))
+        window.progressBar.setValue(0)
+
+        def on_export_finished(exported_path):
+            window.progressBar.setValue(len(rows))
+            QtWidgets.QMessageBox.information(window, 'Export', f'Exported to {exported_path}')
+
+        def on_export_failed(message):
+            QtWidgets.QMessageBox.critical(window, 'Export', f'Export failed: {message}')
+
+        window.export_worker = ExportWorker(path, window._source_headers, rows)
+        window.export_worker.progress.connect(window.progressBar.setValue)
+        window.export_worker.finished.connect(on_export_finished)
+        window.export_worker.failed.connect(on_export_failed)
+        window.export_worker.start()
+    # The Export button is named clear_2 in ui.ui
+    window.clear_2.clicked.connect(on_export)
 
     # Connect the clear button to clear the table
     def on_clear():
-        empty_model = QStandardItemModel()
-        empty_model.setHorizontalHeaderLabels(['hostname', 'pingable', 'cmd_result'])
-        window.result_table.setModel(empty_model)
+        show_results(window, [], 'cmd_result')
     window.clear.clicked.connect(on_clear)
 
     def show_error(message, clear_fields=None):
@@ -276,14 +534,11 @@ def handle_execute(window):
                 field.clear()
 
     def on_execute():
-        print("[LOG] Execute button clicked")
+        logger.debug("Execute button clicked")
         # Clear the result table immediately
-        empty_model = QStandardItemModel()
-        empty_model.setHorizontalHeaderLabels(['hostname', 'pingable', 'cmd_result'])
-        window.result_table.setModel(empty_model)
-        host_infos = []
+        show_results(window, [], 'cmd_result')
         if window.range_radio.isChecked():
-            print("[LOG] Range radio selected")
+            logger.debug("Range radio selected")
             from_text = window.range_from.text().strip()
             to_text = window.range_to.text().strip()
             clear = []
@@ -299,10 +554,7 @@ def handle_execute(window):
             if start > end:
                 show_error('From value must be less than or equal to To value!', [window.range_from, window.range_to])
                 return
-            for n in range(start, end + 1):
-                creds_list = generate_credentials(n)
-                for hostname, username, password in creds_list:
-                    host_infos.append({'hostname': hostname, 'username': username, 'password': password})
+            numbers = range(start, end + 1)
         elif window.list_radio.isChecked():
             list_text = window.list_edit.text().strip()
             if not list_text:
@@ -312,14 +564,20 @@ def handle_execute(window):
             if not items:
                 show_error('List must contain at least one number!', [window.list_edit])
                 return
-            for item in items:
-                creds_list = generate_credentials(item)
-                for hostname, username, password in creds_list:
-                    host_infos.append({'hostname': hostname, 'username': username, 'password': password})
+            # Parse once here so generation only ever sees ints
+            try:
+                numbers = list(map(int, items))
+            except ValueError:
+                show_error('List must contain only numbers!', [window.list_edit])
+                return
         else:
             show_error('No radio button selected!')
             return
 
+        # One call for the whole batch, as parallel lists; duplicate hosts are
+        # dropped so repeated numbers don't ping and SSH the same host twice
+        hostnames, usernames, passwords = generate_credentials_batch(numbers)
+
         combo_cmd = window.command_combo.currentText().strip().lower()
         custom_cmd = window.cmd_prompt.text().strip()
         do_builtin = combo_cmd in BUILTIN_COMMANDS
@@ -334,54 +592,43 @@ def handle_execute(window):
         local_path = ''
         remote_path = ''
         if do_builtin:
-            local_path = window.path_from_edit.text().strip() if hasattr(window, 'path_from_edit') else ''
-            remote_path = window.path_dest_edit.text().strip() if hasattr(window, 'path_dest_edit') else ''
+            local_path = window.path_from_edit.text().strip()
+            remote_path = window.path_dest_edit.text().strip()
             if not local_path:
-                show_error('Source path cannot be empty!', [window.path_from_edit] if hasattr(window, 'path_from_edit') else None)
+                show_error('Source path cannot be empty!', [window.path_from_edit])
                 return
             if not remote_path:
                 remote_path = r'C:\sthi'
-                if hasattr(window, 'path_dest_edit'):
-                    window.path_dest_edit.setText(remote_path)
+                window.path_dest_edit.setText(remote_path)
+
+        # Forget cached ping results so every host is pinged again
+        if window.force_refresh.isChecked():
+            invalidate_pings(hostnames)
 
         # Set up progress bar
         window.progressBar.setMinimum(0)
-        window.progressBar.setMaximum(len(host_infos))
+        window.progressBar.setMaximum(100)
         window.progressBar.setValue(0)
 
         # Create and start the execution worker thread
         def update_progress(val):
-            print(f"[LOG] Progress update: {val}/{len(host_infos)}")
+            logger.debug("Progress update: %s%%", val)
             window.progressBar.setValue(val)
 
         def on_finished(results):
-            print(f"[LOG] Execution finished, displaying {len(results)} results")
+            logger.debug("Execution finished, displaying %s results", len(results))
             # Display results in result_table
-            df = pd.DataFrame(results)
-            df = df.sort_values(by=['pingable', 'hostname'], ascending=[False, True])
-            model = QStandardItemModel()
-            model.setHorizontalHeaderLabels(['hostname', 'pingable', 'cmd_result'])
-            for _, row in df.iterrows():
-                hostname_item = QStandardItem(str(row['hostname']))
-                pingable_item = QStandardItem('Yes' if row['pingable'] else 'No')
-                cmd_result_item = QStandardItem(str(row['cmd_result']))
-                model.appendRow([hostname_item, pingable_item, cmd_result_item])
-            window.result_table.setModel(model)
-            header = window.result_table.horizontalHeader()
-            header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
-            header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
-            header.setSectionResizeMode(2, QtWidgets.QHeaderView.Stretch)
-            window.progressBar.setValue(len(host_infos))
-            print("[LOG] Results displayed in table")
-
-        print(f"[LOG] Creating ExecutionWorker with {len(host_infos)} hosts")
-        window.execution_worker = ExecutionWorker(host_infos, do_builtin, do_custom, local_path, remote_path, custom_cmd)
-        window.execution_worker.builtin_cmd = combo_cmd
+            show_results(window, results, 'cmd_result')
+            window.progressBar.setValue(100)
+            logger.debug("Results displayed in table")
+
+        logger.debug("Creating ExecutionWorker with %s hosts", len(hostnames))
+        window.execution_worker = ExecutionWorker(hostnames, usernames, passwords, window._executor, do_builtin, do_custom, local_path, remote_path, custom_cmd, combo_cmd)
         window.execution_worker.progress.connect(update_progress)
         window.execution_worker.finished.connect(on_finished)
-        print("[LOG] Starting ExecutionWorker thread")
+        logger.debug("Starting ExecutionWorker thread")
         window.execution_worker.start()
-        print("[LOG] ExecutionWorker thread started, returning from on_execute")
+        logger.debug("ExecutionWorker thread started, returning from on_execute")
 
     window.execute.clicked.connect(on_execute)
 
@@ -394,15 +641,12 @@ def handle_scan(window):
                 field.clear()
 
     def on_scan():
-        print("[LOG] Scan button clicked")
+        logger.debug("Scan button clicked")
         # Clear the result table immediately
-        empty_model = QStandardItemModel()
-        empty_model.setHorizontalHeaderLabels(['hostname', 'pingable', 'scan_result'])
-        window.result_table.setModel(empty_model)
+        show_results(window, [], 'scan_result')
         
-        host_infos = []
         if window.range_radio.isChecked():
-            print("[LOG] Range radio selected for scan")
+            logger.debug("Range radio selected for scan")
             from_text = window.range_from.text().strip()
             to_text = window.range_to.text().strip()
             clear = []
@@ -418,10 +662,7 @@ def handle_scan(window):
             if start > end:
                 show_error('From value must be less than or equal to To value!', [window.range_from, window.range_to])
                 return
-            for n in range(start, end + 1):
-                creds_list = generate_credentials(n)
-                for hostname, username, password in creds_list:
-                    host_infos.append({'hostname': hostname, 'username': username, 'password': password})
+            numbers = range(start, end + 1)
         elif window.list_radio.isChecked():
             list_text = window.list_edit.text().strip()
             if not list_text:
@@ -431,82 +672,92 @@ def handle_scan(window):
             if not items:
                 show_error('List must contain at least one number!', [window.list_edit])
                 return
-            for item in items:
-                creds_list = generate_credentials(item)
-                for hostname, username, password in creds_list:
-                    host_infos.append({'hostname': hostname, 'username': username, 'password': password})
+            # Parse once here so generation only ever sees ints
+            try:
+                numbers = list(map(int, items))
+            except ValueError:
+                show_error('List must contain only numbers!', [window.list_edit])
+                return
         else:
             show_error('No radio button selected!')
             return
 
+        # One call for the whole batch, as parallel lists; duplicate hosts are
+        # dropped so repeated numbers don't ping and SSH the same host twice
+        hostnames, usernames, passwords = generate_credentials_batch(numbers)
+
+        # Forget cached ping results so every host is pinged again
+        if window.force_refresh.isChecked():
+            invalidate_pings(hostnames)
+
         # Set up progress bar
         window.progressBar.setMinimum(0)
-        window.progressBar.setMaximum(len(host_infos))
+        window.progressBar.setMaximum(100)
         window.progressBar.setValue(0)
 
         # Create and start the scan worker thread
         def update_progress(val):
-            print(f"[LOG] Scan progress update: {val}/{len(host_infos)}")
+            logger.debug("Scan progress update: %s%%", val)
             window.progressBar.setValue(val)
 
         def on_finished(results):
-            print(f"[LOG] Scan finished, displaying {len(results)} results")
+            logger.debug("Scan finished, displaying %s results", len(results))
             
             # Automatically export to CSV
             csv_path = export_scan_to_csv(results)
             if csv_path:
-                print(f"[LOG] Scan results exported to {csv_path}")
+                logger.debug("Scan results exported to %s", csv_path)
                 QtWidgets.QMessageBox.information(window, 'Scan Complete', 
                                                  f'Scan complete! Results saved to:\n{csv_path}')
             else:
-                print("[LOG] Failed to export scan results to CSV")
+                logger.warning("Failed to export scan results to CSV")
                 QtWidgets.QMessageBox.warning(window, 'Export Warning', 
                                              'Scan complete but failed to save CSV file.')
             
             # Display results in result_table
-            df = pd.DataFrame(results)
-            df = df.sort_values(by=['pingable', 'hostname'], ascending=[False, True])
-            model = QStandardItemModel()
-            model.setHorizontalHeaderLabels(['hostname', 'pingable', 'scan_result'])
-            for _, row in df.iterrows():
-                hostname_item = QStandardItem(str(row['hostname']))
-                pingable_item = QStandardItem('Yes' if row['pingable'] else 'No')
-                scan_result_item = QStandardItem(str(row['scan_result']))
-                model.appendRow([hostname_item, pingable_item, scan_result_item])
-            window.result_table.setModel(model)
-            header = window.result_table.horizontalHeader()
-            header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
-            header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
-            header.setSectionResizeMode(2, QtWidgets.QHeaderView.Stretch)
-            window.progressBar.setValue(len(host_infos))
-            print("[LOG] Scan results displayed in table")
-
-        print(f"[LOG] Creating ScanWorker with {len(host_infos)} hosts")
-        window.scan_worker = ScanWorker(host_infos)
+            show_results(window, results, 'scan_result')
+            window.progressBar.setValue(100)
+            logger.debug("Scan results displayed in table")
+
+        logger.debug("Creating ScanWorker with %s hosts", len(hostnames))
+        window.scan_worker = ScanWorker(hostnames, usernames, passwords, window._executor)
         window.scan_worker.progress.connect(update_progress)
         window.scan_worker.finished.connect(on_finished)
-        print("[LOG] Starting ScanWorker thread")
+        logger.debug("Starting ScanWorker thread")
         window.scan_worker.start()
-        print("[LOG] ScanWorker thread started, returning from on_scan")
+        logger.debug("ScanWorker thread started, returning from on_scan")
 
     window.execute_2.clicked.connect(on_scan)
 
 
 def main():
+    # Per-host debug logging is off unless started with --debug
+    log_listener = setup_logging(logging.DEBUG if '--debug' in sys.argv else logging.WARNING)
+    raise_fd_limit()
     app = QtWidgets.QApplication(sys.argv)
+    app.aboutToQuit.connect(log_listener.stop)
     window = uic.loadUi("ui.ui")
-    # Set up result_table with headers so they are always visible
-    empty_model = QStandardItemModel()
-    empty_model.setHorizontalHeaderLabels(['hostname', 'pingable', 'cmd_result'])
-    window.result_table.setModel(empty_model)
+    # One long-lived pool for all runs instead of spinning threads up per click
+    window._executor = ThreadPoolExecutor(max_workers=compute_max_workers(), thread_name_prefix='ssh')
+    atexit.register(window._executor.shutdown, wait=False)
+    # Set up result_table with one model for the whole session, headers always visible
+    window._result_model = QStandardItemModel(0, 3)
+    window.result_table.setModel(window._result_model)
+    show_results(window, [], 'cmd_result')
     header = window.result_table.horizontalHeader()
-    header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)  # hostname
-    header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)  # pingable
     header.setSectionResizeMode(2, QtWidgets.QHeaderView.Stretch)  # cmd_result
     setup_validators(window)
     handle_radio_buttons(window)
     handle_execute(window)
     handle_scan(window)
+
+    # Queued hosts would otherwise keep the process alive after the window closes
+    def stop_workers():
+        for worker in (getattr(window, 'execution_worker', None), getattr(window, 'scan_worker', None)):
+            if worker is not None:
+                worker.stop()
+    app.aboutToQuit.connect(stop_workers)
+    app.aboutToQuit.connect(_ssh_pool.close_all)
     window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,51 @@
+"""
+Short-lived cache of ping results shared by the Execute and Scan flows
+"""
+import threading
+import time
+
+from ping_utils import ping_hosts
+
+PING_TTL = 60  # seconds a ping result stays valid
+_MAX_ENTRIES = 4096
+
+_cache = {}  # hostname -> (pingable, expires_at)
+_lock = threading.Lock()
+
+
+def cached_ping_hosts(hostnames, ttl=PING_TTL):
+    """
+    Ping hosts, reusing results younger than ttl seconds.
+    :param hostnames: iterable of str
+    :param ttl: int, seconds a fresh result is kept
+    :return: dict mapping hostname -> bool
+    """
+    hostnames = list(dict.fromkeys(hostnames))
+    now = time.monotonic()
+    results = {}
+    with _lock:
+        for host in hostnames:
+            entry = _cache.get(host)
+            if entry is not None and entry[1] > now:
+                results[host] = entry[0]
+    missing = [h for h in hostnames if h not in results]
+    if missing:
+        fresh = ping_hosts(missing)
+        expires_at = time.monotonic() + ttl
+        with _lock:
+            if len(_cache) + len(fresh) > _MAX_ENTRIES:
+                for host in [h for h, (_, exp) in _cache.items() if exp <= now]:
+                    del _cache[host]
+                if len(_cache) + len(fresh) > _MAX_ENTRIES:
+                    _cache.clear()
+            for host, pingable in fresh.items():
+                _cache[host] = (pingable, expires_at)
+        results.update(fresh)
+    return results
+
+
+def invalidate_pings(hostnames):
+    """Drop cached results so the next lookup pings these hosts again."""
+    with _lock:
+        for host in hostnames:
+            _cache.pop(host, None)
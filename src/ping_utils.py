@@ -1,15 +1,86 @@
+import asyncio
 import platform
+import shutil
 import subprocess
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+_FPING = shutil.which('fping')
+
+# Resolved once at import: Windows ping takes -n count and -w in milliseconds,
+# Linux ping takes -c count and -W in seconds (its -w is a total deadline)
+_IS_WINDOWS = platform.system().lower() == 'windows'
+_PING_BASE = ['ping', '-n', '1', '-w'] if _IS_WINDOWS else ['ping', '-c', '1', '-W']
+
+
+def _ping_command(hostname, timeout):
+    return _PING_BASE + [str(timeout * 1000 if _IS_WINDOWS else timeout), hostname]
+
 
 def ping_host(hostname, timeout=1):
     """Ping a single host, return True if pingable, else False."""
-    param = '-n' if platform.system().lower() == 'windows' else '-c'
     try:
-        result = subprocess.run([
-            'ping', param, '1', '-w', str(timeout * 1000), hostname
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        result = subprocess.run(
+            _ping_command(hostname, timeout), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            timeout=timeout + 1
+        )
         return result.returncode == 0
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+async def _ping_host_async(hostname, timeout, sem):
+    async with sem:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *_ping_command(hostname, timeout),
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                return await asyncio.wait_for(proc.wait(), timeout + 1) == 0
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return False
+        except Exception:
+            return False
+
+
+def _fping_hosts(hostnames, timeout):
+    """Ping all hosts with one fping process; hosts are fed on stdin."""
+    result = subprocess.run(
+        # One retry at half the timeout each keeps the worst case at ~timeout
+        [_FPING, '-a', '-q', '-r', '1', '-t', str(timeout * 500)],
+        input='\n'.join(hostnames), capture_output=True, text=True
+    )
+    # 0/1/2 mean all alive, some unreachable, some unresolvable; 3 and 4 mean fping
+    # itself failed (e.g. no raw socket), so its empty output says nothing about the hosts
+    if result.returncode >= 3:
+        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+    alive = set(result.stdout.split())
+    return {h: h in alive for h in hostnames}
+
+
+def ping_hosts(hostnames, timeout=1, concurrency=200):
+    """
+    Ping many hosts concurrently, using a single fping process when available
+    and otherwise one event loop driving the ping processes.
+    :param hostnames: iterable of str
+    :param timeout: int, per-host timeout in seconds
+    :param concurrency: int, maximum number of ping processes in flight
+    :return: dict mapping hostname -> bool
+    """
+    hostnames = list(dict.fromkeys(hostnames))
+    if not hostnames:
+        return {}
+    if _FPING is not None:
+        try:
+            return _fping_hosts(hostnames, timeout)
+        except Exception:
+            pass
+
+    async def run_all():
+        sem = asyncio.Semaphore(concurrency)
+        alive = await asyncio.gather(*(_ping_host_async(h, timeout, sem) for h in hostnames))
+        return dict(zip(hostnames, alive))
+
+    return asyncio.run(run_all())
@@ -2,14 +2,16 @@
 Scan utilities for pinging and SSH connectivity testing
 """
 import csv
+import logging
 from datetime import datetime
 
-import paramiko
-
 from ping_utils import ping_host
+from ssh_pool import run_command
+
+logger = logging.getLogger(__name__)
 
 
-def scan_host(hostname, username, password):
+def scan_host(hostname, username, password, pingable=None, client=None):
     """
     Scan a single host: ping and execute 'echo hello {hostname}' via SSH
     
@@ -17,6 +19,8 @@ def scan_host(hostname, username, password):
         hostname: The host to scan
         username: SSH username
         password: SSH password
+        pingable: Known ping result; the host is pinged here when None
+        client: Optional connected paramiko.SSHClient to reuse; it is left open
     
     Returns:
         dict: Result containing hostname, username, password, pingable status, and scan result
@@ -30,29 +34,32 @@ def scan_host(hostname, username, password):
     }
     
     # Step 1: Ping the host
-    try:
-        pingable = ping_host(hostname)
-        result['pingable'] = pingable
-    except Exception as e:
-        result['scan_result'] = f'Ping error: {e}'
-        return result
+    if pingable is None:
+        try:
+            pingable = ping_host(hostname)
+        except Exception as e:
+            result['scan_result'] = f'Ping error: {e}'
+            return result
+    result['pingable'] = pingable
     
     if not pingable:
         result['scan_result'] = 'Unreachable'
         return result
     
     # Step 2: SSH and execute echo command
-    ssh = None
+    ssh = client
     try:
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(hostname, username=username, password=password, timeout=5)
+        if ssh is None:
+            import paramiko  # Deferred until a host actually needs SSH
+
+            ssh = paramiko.SSHClient()
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            ssh.connect(hostname, username=username, password=password, timeout=5,
+                        allow_agent=False, look_for_keys=False, banner_timeout=10, auth_timeout=10)
         
         # Execute echo command
         cmd = f'echo hello {hostname}'
-        stdin, stdout, stderr = ssh.exec_command(cmd)
-        output = stdout.read().decode(errors='replace').strip()
-        error = stderr.read().decode(errors='replace').strip()
+        _, output, error = run_command(ssh, cmd)
         
         if error:
             result['scan_result'] = f'Error: {error}'
@@ -62,7 +69,7 @@ def scan_host(hostname, username, password):
     except Exception as e:
         result['scan_result'] = f'SSH Error: {e}'
     finally:
-        if ssh is not None:
+        if ssh is not None and client is None:
             try:
                 ssh.close()
             except Exception:
@@ -71,6 +78,20 @@ def scan_host(hostname, username, password):
     return result
 
 
+def _scan_csv_row(result):
+    """Flatten one scan result dict into a CSV row."""
+    pingable = result.get('pingable', False)
+    # Determine if SSH was successful
+    scan_result = result.get('scan_result', '')
+    ssh_able = 'Yes' if (pingable and
+                         scan_result and
+                         not scan_result.startswith('SSH Error:') and
+                         not scan_result.startswith('Error:') and
+                         scan_result not in ('Unreachable', 'Cancelled')) else 'No'
+    return (result.get('hostname', ''), result.get('username', ''), result.get('password', ''),
+            'Yes' if pingable else 'No', ssh_able)
+
+
 def export_scan_to_csv(scan_results):
     """
     Automatically export scan results to CSV file with timestamp
@@ -86,29 +107,15 @@ def export_scan_to_csv(scan_results):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filepath = f'scan_results_{timestamp}.csv'
         
-        with open(filepath, 'w', encoding='utf-8', newline='') as f:
+        # Large buffer so rows reach the disk in a few big writes, not one per row
+        with open(filepath, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
             writer = csv.writer(f)
             # Write headers
             writer.writerow(['host', 'username', 'password', 'pingable', 'ssh_able'])
-            
-            # Write data rows
-            for result in scan_results:
-                host = result.get('hostname', '')
-                username = result.get('username', '')
-                password = result.get('password', '')
-                pingable = 'Yes' if result.get('pingable', False) else 'No'
-                
-                # Determine if SSH was successful
-                scan_result = result.get('scan_result', '')
-                ssh_able = 'Yes' if (result.get('pingable', False) and 
-                                    scan_result and 
-                                    not scan_result.startswith('SSH Error:') and
-                                    not scan_result.startswith('Error:') and
-                                    scan_result != 'Unreachable') else 'No'
-                
-                writer.writerow([host, username, password, pingable, ssh_able])
+            # Write data rows; writerows drives the generator in one call
+            writer.writerows(_scan_csv_row(result) for result in scan_results)
         
         return filepath
     except Exception as e:
-        print(f"Error exporting to CSV: {e}")
+        logger.error("Error exporting to CSV: %s", e)
         return None
@@ -1,9 +1,86 @@
+import logging
+import ntpath
 import os
+import posixpath
+import shlex
+import tarfile
 
-import paramiko
+from ssh_pool import run_command
 
+logger = logging.getLogger(__name__)
 
-def ssh_copy(hostname, username, password, local_path, remote_path):
+# cmd.exe rejects command lines longer than 8191 characters
+_MAX_COMMAND_LEN = 8000
+
+
+def _is_windows_path(path):
+    """True for paths like C:\\dir or \\\\server\\share, which need cmd.exe syntax remotely."""
+    return bool(ntpath.splitdrive(path)[0]) or '\\' in path
+
+
+def _remote_join(remote_path, *parts):
+    """Join path parts using the remote host's separator, not the local one."""
+    module = ntpath if _is_windows_path(remote_path) else posixpath
+    return module.join(remote_path, *parts)
+
+
+def _make_remote_dirs(ssh, remote_dirs):
+    """
+    Create all remote_dirs (and their parents) with as few remote commands as
+    possible, splitting the paths so each command line stays under cmd.exe's limit.
+    """
+    if _is_windows_path(remote_dirs[0]):
+        # cmd's mkdir takes several paths and creates parents; existing ones only warn
+        prefix, suffix, args = 'mkdir', ' 2>nul', [f'"{d}"' for d in remote_dirs]
+    else:
+        prefix, suffix, args = 'mkdir -p', '', [shlex.quote(d) for d in remote_dirs]
+    batches = [[]]
+    length = len(prefix) + len(suffix)
+    for arg in args:
+        if batches[-1] and length + 1 + len(arg) > _MAX_COMMAND_LEN:
+            batches.append([])
+            length = len(prefix) + len(suffix)
+        batches[-1].append(arg)
+        length += 1 + len(arg)
+    for batch in batches:
+        command = ' '.join([prefix] + batch) + suffix
+        logger.debug("Running command: %s", command)
+        try:
+            run_command(ssh, command, timeout=10)
+        except Exception as e:
+            # Continue anyway, the upload reports a clearer error if a directory is missing
+            logger.warning("Failed to create remote directories via SSH command: %s", e)
+
+
+def _tar_upload(ssh, local_dir, remote_dir, timeout=30):
+    """
+    Stream local_dir into remote_dir as a single tar archive over one channel,
+    so a folder costs one round trip instead of one SFTP request per file.
+    Raises OSError if the remote tar fails (e.g. no tar on the host).
+    """
+    if _is_windows_path(remote_dir):
+        # Windows 10+ ships bsdtar as tar.exe; cmd's mkdir creates parents
+        command = f'mkdir "{remote_dir}" 2>nul & tar -xf - -C "{remote_dir}"'
+    else:
+        quoted = shlex.quote(remote_dir)
+        command = f'mkdir -p {quoted} && tar -xf - -C {quoted}'
+    chan = ssh.get_transport().open_session(timeout=timeout)
+    try:
+        chan.settimeout(timeout)
+        chan.exec_command(command)
+        with chan.makefile('wb') as stream:
+            with tarfile.open(fileobj=stream, mode='w|') as archive:
+                archive.add(local_dir, arcname='.')
+        chan.shutdown_write()
+        err = chan.makefile_stderr('rb').read().decode(errors='replace').strip()
+        status = chan.recv_exit_status()
+    finally:
+        chan.close()
+    if status != 0:
+        raise OSError(f'remote tar exited with status {status}: {err}')
+
+
+def ssh_copy(hostname, username, password, local_path, remote_path, client=None):
     """
     Copy a file or folder to a remote host via SSH using paramiko SFTP.
     :param hostname: str, remote host
@@ -11,79 +88,73 @@ def ssh_copy(hostname, username, password, local_path, remote_path):
     :param password: str, SSH password
     :param local_path: str, local file or folder path
     :param remote_path: str, remote destination path
+    :param client: paramiko.SSHClient, optional already connected client to reuse;
+                   it is left open for the caller
     :return: str, result message
     """
-    print(f"[ssh_copy] Starting copy to {hostname}")
-    ssh = None
+    logger.debug("Starting copy to %s", hostname)
+    ssh = client
     sftp = None
     try:
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        print(f"[ssh_copy] Connecting to {hostname}...")
-        ssh.connect(hostname, username=username, password=password, timeout=10, banner_timeout=10, auth_timeout=10)
-        print(f"[ssh_copy] Connected to {hostname}, opening SFTP...")
-        sftp = ssh.open_sftp()
-        print(f"[ssh_copy] SFTP opened for {hostname}")
-        
-        # Ensure remote path exists using SSH command instead of SFTP
-        print(f"[ssh_copy] Creating remote directory {remote_path} on {hostname} via SSH command")
-        try:
-            # Use mkdir command with /p flag to create parent directories if needed
-            mkdir_cmd = f'mkdir "{remote_path}" 2>nul || cd .'
-            print(f"[ssh_copy] Running command: {mkdir_cmd}")
-            stdin, stdout, stderr = ssh.exec_command(mkdir_cmd, timeout=5)
-            stdout.read()  # Wait for command to complete
-            stderr.read()
-            print(f"[ssh_copy] Directory creation command completed for {hostname}")
-        except Exception as e:
-            print(f"[ssh_copy] Failed to create directory via SSH command: {e}")
-            # Continue anyway, directory might already exist
-        
-        print(f"[ssh_copy] Remote directory ensured for {hostname}")
-        
+        if ssh is None:
+            import paramiko  # Deferred until a copy actually needs its own connection
+
+            ssh = paramiko.SSHClient()
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            logger.debug("Connecting to %s...", hostname)
+            ssh.connect(hostname, username=username, password=password, timeout=10, banner_timeout=10, auth_timeout=10,
+                        allow_agent=False, look_for_keys=False)
+            logger.debug("Connected to %s, opening SFTP...", hostname)
+
         if os.path.isfile(local_path):
             # Copy single file
-            print(f"[ssh_copy] Copying single file to {hostname}")
-            remote_file = os.path.join(remote_path, os.path.basename(local_path))
+            logger.debug("Copying single file to %s", hostname)
+            _make_remote_dirs(ssh, [remote_path])
+            sftp = ssh.open_sftp()
+            logger.debug("SFTP opened for %s", hostname)
+            remote_file = _remote_join(remote_path, os.path.basename(local_path))
             sftp.put(local_path, remote_file)
             result = f'File copied to {remote_file}'
-            print(f"[ssh_copy] File copy completed for {hostname}")
+            logger.debug("File copy completed for %s", hostname)
         elif os.path.isdir(local_path):
             # Recursively copy folder
-            print(f"[ssh_copy] Copying folder to {hostname}")
-            def recursive_upload(local_dir, remote_dir):
-                try:
-                    sftp.mkdir(remote_dir)
-                except IOError:
-                    pass  # Directory may already exist
-                for item in os.listdir(local_dir):
-                    local_item = os.path.join(local_dir, item)
-                    remote_item = os.path.join(remote_dir, item)
-                    if os.path.isdir(local_item):
-                        recursive_upload(local_item, remote_item)
-                    else:
-                        sftp.put(local_item, remote_item)
-            recursive_upload(local_path, remote_path)
+            logger.debug("Copying folder to %s", hostname)
+            try:
+                _tar_upload(ssh, local_path, remote_path)
+            except Exception as e:
+                # Fall back to one SFTP put per file if the host can't unpack tar
+                logger.warning("tar upload to %s failed, falling back to SFTP: %s", hostname, e)
+                # Walk locally so the whole remote tree is created in one round trip
+                tree = []
+                for local_dir, _, files in os.walk(local_path):
+                    rel = os.path.relpath(local_dir, local_path)
+                    remote_dir = remote_path if rel == '.' else _remote_join(remote_path, *rel.split(os.sep))
+                    tree.append((local_dir, remote_dir, files))
+                _make_remote_dirs(ssh, [remote_dir for _, remote_dir, _ in tree])
+                sftp = ssh.open_sftp()
+                for local_dir, remote_dir, files in tree:
+                    for name in files:
+                        sftp.put(os.path.join(local_dir, name), _remote_join(remote_dir, name))
             result = f'Folder copied to {remote_path}'
-            print(f"[ssh_copy] Folder copy completed for {hostname}")
+            logger.debug("Folder copy completed for %s", hostname)
         else:
             result = 'Local path does not exist.'
-            print(f"[ssh_copy] Local path does not exist for {hostname}")
+            logger.debug("Local path does not exist for %s", hostname)
         return result
     except Exception as e:
-        print(f"[ssh_copy] Exception for {hostname}: {e}")
+        logger.warning("Exception for %s: %s", hostname, e)
         return f'Copy failed: {e}'
     finally:
-        print(f"[ssh_copy] Cleanup for {hostname}")
+        logger.debug("Cleanup for %s", hostname)
         if sftp is not None:
             try:
                 sftp.close()
-                print(f"[ssh_copy] SFTP closed for {hostname}")
+                logger.debug("SFTP closed for %s", hostname)
             except Exception as e:
-                print(f"[ssh_copy] Error closing SFTP for {hostname}: {e}")
-        if ssh is not None:
+                logger.warning("Error closing SFTP for %s: %s", hostname, e)
+        if ssh is not None and client is None:
             try:
                 ssh.close()
-                print(f"[ssh_copy] SSH closed for {hostname}")
+                logger.debug("SSH closed for %s", hostname)
             except Exception as e:
-                print(f"[ssh_copy] Error closing SSH for {hostname}: {e}")
+                logger.warning("Error closing SSH for %s: %s", hostname, e)
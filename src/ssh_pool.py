@@ -0,0 +1,235 @@
+"""
+Pool of authenticated paramiko SSH connections shared by the workers
+"""
+import queue
+import selectors
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+
+class SSHConnectionPool:
+    """
+    Keep idle SSH connections per (host, user) so repeated operations on the
+    same host skip the TCP + key exchange + auth handshake.
+    """
+
+    def __init__(self, max_per_host=4, connect_timeout=5, keepalive=30, idle_timeout=30):
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._host_key_policy = None
+        self._reaper = None
+
+    def _queue_for(self, key):
+        with self._lock:
+            q = self._idle.get(key)
+            if q is None:
+                q = queue.Queue(maxsize=self.max_per_host)
+                self._idle[key] = q
+            return q
+
+    @staticmethod
+    def _is_alive(client):
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def _connect(self, host, username, password):
+        # Deferred so the UI starts without loading paramiko's crypto stack
+        import paramiko
+
+        # The policy object is stateless, so every connection shares one instance
+        if self._host_key_policy is None:
+            self._host_key_policy = paramiko.AutoAddPolicy()
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(self._host_key_policy)
+        try:
+            # Password auth only: skip probing ~/.ssh keys and the agent socket, and
+            # bound the banner/auth phases so a hung sshd can't pin a worker thread
+            client.connect(host, username=username, password=password, timeout=self.connect_timeout,
+                           allow_agent=False, look_for_keys=False, banner_timeout=10, auth_timeout=10)
+            client.get_transport().set_keepalive(self.keepalive)
+        except BaseException:
+            # A failed connect (e.g. wrong password) leaves the socket and transport
+            # thread running; paramiko does not tear them down itself
+            client.close()
+            raise
+        return client
+
+    def _reap_expired(self):
+        """Close idle clients whose idle_timeout has passed, across all hosts."""
+        now = time.monotonic()
+        with self._lock:
+            queues = list(self._idle.values())
+        for q in queues:
+            keep = []
+            while True:
+                try:
+                    entry = q.get_nowait()
+                except queue.Empty:
+                    break
+                if entry[1] > now:
+                    keep.append(entry)
+                else:
+                    entry[0].close()
+            for entry in keep:
+                try:
+                    q.put_nowait(entry)
+                except queue.Full:
+                    entry[0].close()
+
+    def _reap_loop(self):
+        # Each idle client holds a socket and a transport thread, so expired ones
+        # are closed even when no further acquire() comes for their host
+        while True:
+            time.sleep(self.idle_timeout / 2)
+            self._reap_expired()
+
+    def _ensure_reaper(self):
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, name='ssh-pool-reaper', daemon=True)
+                self._reaper.start()
+
+    def acquire(self, host, username, password):
+        """
+        Return a live SSHClient for host/username, reusing an idle one if possible.
+        """
+        q = self._queue_for((host, username))
+        while True:
+            try:
+                client, expires_at = q.get_nowait()
+            except queue.Empty:
+                break
+            if expires_at > time.monotonic() and self._is_alive(client):
+                return client
+            client.close()
+        return self._connect(host, username, password)
+
+    def release(self, host, username, client):
+        """
+        Hand a client back to the pool; it is closed if the pool is full or it died.
+        Idle clients older than idle_timeout are closed by a background reaper.
+        """
+        if not self._is_alive(client):
+            client.close()
+            return
+        self._ensure_reaper()
+        try:
+            self._queue_for((host, username)).put_nowait((client, time.monotonic() + self.idle_timeout))
+        except queue.Full:
+            client.close()
+
+    def close_all(self):
+        """Close every idle connection, e.g. when the application exits."""
+        with self._lock:
+            queues = list(self._idle.values())
+            self._idle.clear()
+        for q in queues:
+            while True:
+                try:
+                    client, _ = q.get_nowait()
+                except queue.Empty:
+                    break
+                client.close()
+
+    @contextmanager
+    def borrow(self, host, username, password):
+        """
+        Context manager around acquire/release. A client whose block raised is
+        closed rather than returned, since its transport state is unknown.
+        """
+        client = self.acquire(host, username, password)
+        try:
+            yield client
+        except BaseException:
+            client.close()
+            raise
+        else:
+            self.release(host, username, client)
+
+
+def run_command(client, command, timeout=30, max_output=1 << 20, combine_stderr=False):
+    """
+    Run command on a fresh channel of an existing connection.
+
+    stdout and stderr are drained together, so a command that fills one stream
+    cannot stall on a full channel window while the other one is being read.
+    The deadline is checked on every pass, even while output keeps arriving.
+    Output past max_output bytes is discarded; once every kept stream is full the
+    command is abandoned. stdout carries a marker whenever it was truncated.
+    :param client: paramiko.SSHClient, connected client
+    :param command: str, command line for the remote shell
+    :param timeout: int, seconds before the command is abandoned
+    :param max_output: int, bytes kept per stream
+    :param combine_stderr: bool, interleave stderr into stdout on the server side,
+                           so only one stream is drained and stderr comes back empty
+    :return: tuple (exit_status, stdout, stderr) with decoded, stripped output;
+             exit_status is -1 if the output was truncated before the command ended
+    """
+    chan = client.get_transport().open_session(timeout=timeout)
+    # poll/epoll-backed on POSIX, so channel fds above FD_SETSIZE (1024) still work
+    selector = selectors.DefaultSelector()
+    try:
+        chan.settimeout(timeout)
+        chan.set_combine_stderr(combine_stderr)
+        chan.exec_command(command)
+        out, err = bytearray(), bytearray()
+        deadline = time.monotonic() + timeout
+        truncated = False  # abandoned with the command still running
+        dropped = False  # some stdout past max_output was discarded
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout(f'command timed out after {timeout}s')
+            got_data = False
+            if chan.recv_ready():
+                data = chan.recv(65536)
+                if len(out) + len(data) > max_output:
+                    dropped = True
+                if len(out) < max_output:
+                    out += data[:max_output - len(out)]
+                got_data = True
+            if chan.recv_stderr_ready():
+                data = chan.recv_stderr(65536)
+                if len(err) < max_output:
+                    err += data[:max_output - len(err)]
+                got_data = True
+            if got_data:
+                if len(out) >= max_output and (combine_stderr or len(err) >= max_output):
+                    truncated = True
+                    break
+                continue
+            if chan.exit_status_ready() and not chan.recv_ready() and not chan.recv_stderr_ready():
+                break
+            if chan.eof_received:
+                # Both streams are finished; only the exit status is still to come
+                chan.status_event.wait(remaining)
+            else:
+                # The channel's fileno becomes readable on stdout/stderr data, EOF or close
+                if not selector.get_map():
+                    selector.register(chan, selectors.EVENT_READ)
+                selector.select(remaining)
+        if truncated:
+            # Closing the channel below abandons the command; its status is only
+            # known if it had already exited
+            status = chan.recv_exit_status() if chan.exit_status_ready() else -1
+        else:
+            status = chan.recv_exit_status()
+    finally:
+        selector.close()
+        chan.close()
+    out = out.decode(errors='replace').strip()
+    if truncated or dropped:
+        out += f'\n[output truncated at {max_output} bytes]'
+    return status, out, err.decode(errors='replace').strip()